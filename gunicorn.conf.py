@@ -0,0 +1,24 @@
+"""
+Gunicorn configuration for serving the Deepfake Detection app.
+
+Usage:
+  gunicorn app:app
+
+One worker process holds the model and the micro-batching thread, and its
+request threads share both. The app is intentionally not preloaded in the
+master process: TensorFlow's runtime and the batching thread do not survive
+fork(), so each worker loads the model itself after it starts.
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('THREADS', 8))
+# Each worker imports app.py itself (preload_app is off) and XLA-compiles one
+# EfficientNet program per batch bucket before it can report in. The master
+# kills a worker that stays silent longer than this, so it must cover that
+# warm-up on a slow CPU host, not just a single request.
+timeout = int(os.environ.get('TIMEOUT', 600))
+preload_app = False
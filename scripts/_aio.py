@@ -0,0 +1,70 @@
+"""
+Shared asyncio helpers for the concurrent download scripts.
+
+Importing this module installs the libuv event loop when uvloop is
+available (the default loop works too). download_all() fetches a list of
+(url, dest) jobs over one aiohttp session with a per-host concurrency cap
+(MAX_CONCURRENT_DOWNLOADS unless the caller passes its own) and a
+timer-driven progress line.
+"""
+
+import asyncio
+
+import aiohttp
+
+# Use the libuv event loop when it is installed; the default loop works too
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Concurrent requests per host; all requests share one session so TLS
+# handshakes are amortized over kept-alive connections
+MAX_CONCURRENT_DOWNLOADS = 64
+
+# Seconds between progress lines while downloading
+PROGRESS_INTERVAL = 1.0
+
+
+async def fetch(session, sem, url, dest, verbose=False):
+    """Download one file to dest. Returns True on success."""
+    async with sem:
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                data = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if verbose:
+                print(f"   ✗ Failed to download {url}: {e}")
+            return False
+    await asyncio.to_thread(dest.write_bytes, data)
+    return True
+
+
+async def download_all(jobs, desc, verbose=False, concurrency=MAX_CONCURRENT_DOWNLOADS):
+    """Download (url, dest) jobs concurrently and return how many succeeded."""
+    sem = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    successful = 0
+    done = 0
+
+    async def report_progress():
+        # One timer-driven line per interval instead of a bar redraw per task,
+        # so failure messages stay readable
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL)
+            print(f"   {desc}: {done}/{len(jobs)} ({successful} ok)")
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        tasks = [fetch(session, sem, url, dest, verbose) for url, dest in jobs]
+        reporter = asyncio.create_task(report_progress())
+        try:
+            for task in asyncio.as_completed(tasks):
+                successful += await task
+                done += 1
+        finally:
+            reporter.cancel()
+    return successful
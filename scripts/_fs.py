@@ -0,0 +1,11 @@
+"""
+Shared filesystem helpers for the dataset scripts.
+"""
+
+import os
+
+
+def count_files(directory):
+    """Count regular files in a directory with one os.scandir pass (no glob, no Path objects)."""
+    with os.scandir(directory) as entries:
+        return sum(1 for e in entries if e.is_file())
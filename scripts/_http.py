@@ -0,0 +1,24 @@
+"""
+Shared HTTP session for the synchronous download scripts.
+
+Importing this module gives every download in the process one connection
+pool, so repeated requests to the same host reuse kept-alive connections
+instead of paying a new TCP/TLS handshake each time. Transient failures
+(429, 502, 503 and connection errors) are retried with backoff.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Read/write size for streaming downloads
+CHUNK_SIZE = 1 << 20
+
+session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503]),
+)
+session.mount('https://', _adapter)
+session.mount('http://', _adapter)
@@ -1,5 +1,6 @@
 # analyze_dataset.py
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import numpy as np
@@ -28,15 +29,26 @@ def quick_visual_inspection(data_dir, num_samples=50):
         (40000, total, f"Images 40000-{total}")
     ]
     
+    # Sample 10 random images from each range
+    samples_per_range = []
+    for start, end, label in ranges:
+        range_images = all_images[start:end]
+        samples_per_range.append(
+            np.random.choice(range_images, size=min(10, len(range_images)), replace=False))
+    
+    # Decode all samples in parallel, shrunk to display size
+    def load_thumbnail(img_path):
+        return np.asarray(Image.open(img_path).convert('RGB').resize((128, 128)))
+    
+    all_paths = [img_path for samples in samples_per_range for img_path in samples]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        thumbnails = iter(list(executor.map(load_thumbnail, all_paths)))
+    
     fig, axes = plt.subplots(len(ranges), 10, figsize=(20, len(ranges)*2))
     
-    for row_idx, (start, end, label) in enumerate(ranges):
-        # Sample 10 random images from this range
-        range_images = all_images[start:end]
-        samples = np.random.choice(range_images, size=min(10, len(range_images)), replace=False)
-        
-        for col_idx, img_path in enumerate(samples):
-            img = Image.open(img_path)
+    for row_idx, ((start, end, label), samples) in enumerate(zip(ranges, samples_per_range)):
+        for col_idx in range(len(samples)):
+            img = next(thumbnails)
             axes[row_idx, col_idx].imshow(img)
             axes[row_idx, col_idx].axis('off')
             
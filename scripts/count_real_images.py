@@ -1,4 +1,5 @@
 # count_real_images.py
+import os
 from pathlib import Path
 from collections import Counter
 
@@ -15,16 +16,16 @@ def count_real_images(data_dir='data/raw'):
     # Common image extensions
     image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
     
-    # Count all image files
-    all_images = []
-    for ext in image_extensions:
-        all_images.extend(list(real_dir.glob(f'*{ext}')))
-        all_images.extend(list(real_dir.glob(f'*{ext.upper()}')))
+    # Count image files by extension in a single directory pass
+    ext_counter = Counter()
+    with os.scandir(real_dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in image_extensions:
+                    ext_counter[ext] += 1
     
-    total = len(all_images)
-    
-    # Count by extension
-    ext_counter = Counter([img.suffix.lower() for img in all_images])
+    total = sum(ext_counter.values())
     
     print(f"📊 Image count in {real_dir}:")
     print(f"   Total images: {total}")
@@ -13,11 +13,14 @@ Setup:
 """
 
 import os
+import errno
 import shutil
 from pathlib import Path
 from tqdm import tqdm
 import sys
 
+from _fs import count_files
+
 # Try to import kagglehub
 try:
     import kagglehub
@@ -54,6 +57,39 @@ def download_dfd_dataset():
         return None
 
 
+def link_or_copy(src, dst):
+    """
+    Hardlink src to dst, falling back to a copy when linking is not possible.
+
+    A hardlink shares the downloaded file's inode, so no bytes are copied and
+    no extra disk space is used. The training images are never modified, but
+    note that editing either path in place changes both.
+    """
+    # A re-run finds dst from the previous run, often as the same inode
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        # Different filesystem (EXDEV), no hardlink support (EPERM) or the
+        # inode's link limit (EMLINK); anything else is a real error.
+        # shutil.copy2 already uses in-kernel sendfile on Linux.
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+        shutil.copy2(src, dst)
+
+
+def list_images(directory):
+    """List .png/.jpg files in a directory with a single os.scandir pass."""
+    with os.scandir(directory) as entries:
+        return [
+            entry for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(('.png', '.jpg'))
+        ]
+
+
 def organize_dfd_dataset(dataset_path, output_dir=None):
     """
     Organize the downloaded DFD dataset into training/validation structure.
@@ -112,9 +148,9 @@ def organize_dfd_dataset(dataset_path, output_dir=None):
     for d in [seed_real, seed_fake, val_real, val_fake]:
         d.mkdir(parents=True, exist_ok=True)
     
-    # Get all image files
-    real_files = list(real_src.glob("*.png")) + list(real_src.glob("*.jpg"))
-    fake_files = list(fake_src.glob("*.png")) + list(fake_src.glob("*.jpg"))
+    # Get all image files (os.DirEntry objects, usable directly as paths)
+    real_files = list_images(real_src)
+    fake_files = list_images(fake_src)
     
     print(f"\nFound {len(real_files)} real images")
     print(f"Found {len(fake_files)} fake images")
@@ -137,8 +173,8 @@ def organize_dfd_dataset(dataset_path, output_dir=None):
     print(f"  Real: {len(real_train)} train, {len(real_val)} validation")
     print(f"  Fake: {len(fake_train)} train, {len(fake_val)} validation")
     
-    # Copy files
-    print("\nCopying files...")
+    # Link (or copy) files
+    print("\nLinking files...")
     
     for files, dest in [
         (real_train, seed_real),
@@ -149,29 +185,26 @@ def organize_dfd_dataset(dataset_path, output_dir=None):
         for src_file in tqdm(files, desc=f"→ {dest.name}"):
             try:
                 dst_file = dest / src_file.name
-                shutil.copy2(src_file, dst_file)
+                link_or_copy(src_file, dst_file)
             except Exception as e:
-                print(f"  ⚠ Failed to copy {src_file}: {e}")
+                print(f"  ⚠ Failed to link or copy {src_file.path}: {e}")
     
     # Summary
     print("\n" + "="*70)
     print("✓ Dataset organized successfully!")
     print("="*70)
     
+    counts = {d: count_files(d) for d in [seed_real, seed_fake, val_real, val_fake]}
+    
     print(f"\nTraining data:")
-    print(f"  data/seed/real:  {len(list(seed_real.glob('*')))} images")
-    print(f"  data/seed/fake:  {len(list(seed_fake.glob('*')))} images")
+    print(f"  data/seed/real:  {counts[seed_real]} images")
+    print(f"  data/seed/fake:  {counts[seed_fake]} images")
     
     print(f"\nValidation data:")
-    print(f"  data/validation/real:  {len(list(val_real.glob('*')))} images")
-    print(f"  data/validation/fake:  {len(list(val_fake.glob('*')))} images")
-    
-    total = (
-        len(list(seed_real.glob('*'))) +
-        len(list(seed_fake.glob('*'))) +
-        len(list(val_real.glob('*'))) +
-        len(list(val_fake.glob('*')))
-    )
+    print(f"  data/validation/real:  {counts[val_real]} images")
+    print(f"  data/validation/fake:  {counts[val_fake]} images")
+    
+    total = sum(counts.values())
     
     print(f"\nTotal images: {total}")
     print(f"Location: {output_dir}")
@@ -7,14 +7,20 @@ Sources:
 """
 
 import os
-import urllib.request
-import urllib.error
+import asyncio
+import uuid
 from pathlib import Path
-import time
+
+from _aio import download_all
 
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'seed' / 'fake'
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Concurrent downloads in flight; also the connection-pool limit, which
+# replaces the old fixed delay between requests as the rate control
+MAX_CONCURRENT_DOWNLOADS = 8
+
+
 def download_synthetic_faces(count=100):
     """
     Download AI-generated synthetic faces from ThisPersonDoesNotExist.com.
@@ -26,29 +32,14 @@ def download_synthetic_faces(count=100):
     print(f"\n📥 Downloading {count} synthetic AI-generated faces...")
     print("   Source: https://thistle-playground-images.s3.amazonaws.com/")
     
+    # A random UUID per request for variety
     api_url = "https://this-person-does-not-exist.com/api?uuid="
-    
-    successful = 0
-    for i in range(count):
-        try:
-            # Generate a random UUID for variety
-            import uuid
-            unique_id = str(uuid.uuid4())
-            url = f"{api_url}{unique_id}"
-            
-            dest = DATA_DIR / f"synthetic_{i:05d}.jpg"
-            urllib.request.urlretrieve(url, dest)
-            successful += 1
-            
-            if (i + 1) % 10 == 0:
-                print(f"   ✓ Downloaded {successful} synthetic faces...")
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"   ⚠ Failed to download synthetic face {i}: {e}")
-            continue
+    jobs = [
+        (f"{api_url}{uuid.uuid4()}", DATA_DIR / f"synthetic_{i:05d}.jpg")
+        for i in range(count)
+    ]
+    successful = asyncio.run(download_all(
+        jobs, "Synthetic faces", verbose=True, concurrency=MAX_CONCURRENT_DOWNLOADS))
     
     print(f"   ✓ Total: {successful} synthetic faces downloaded")
     return successful
@@ -4,31 +4,133 @@
 Usage:
   python scripts/download_fake_faces_improved.py --train 250 --val 50
 
-The script will download images with retries, validate them with Pillow,
-and save them into `data/seed/fake/` and `data/validation/fake/`.
+The script will download images concurrently with retries, check that each
+is a complete 1024x1024 JPEG (or verify it with Pillow when `--strict` is
+given), and save them into `data/seed/fake/` and `data/validation/fake/`.
 """
 import argparse
+import asyncio
 import os
 import time
-import requests
+import aiohttp
 from PIL import Image
 from io import BytesIO
 
+import _aio  # noqa: F401 -- installs uvloop when available
+
 URL = "https://thispersondoesnotexist.com/image"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)"
+                  "Chrome/91.0.4472.114 Safari/537.36"
+}
+# thispersondoesnotexist.com always serves 1024x1024 JPEGs
+EXPECTED_SIZE = (1024, 1024)
+# JPEG start-of-frame markers (all SOFn except DHT/JPG/DAC)
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+MAX_BACKOFF = 60.0
+# Seconds to stay at a reduced request rate after a 429
+RATE_COOLDOWN = 30.0
+
+class RateLimited(Exception):
+    """Raised on HTTP 429; carries the server's Retry-After delay, if any."""
+    def __init__(self, retry_after):
+        super().__init__(f"rate limited (Retry-After: {retry_after})")
+        self.retry_after = retry_after
+
+class RateLimiter:
+    """Async token bucket: bursts up to `rate` requests, refilling at `rate` per second."""
+    def __init__(self, rate):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.max_rate = rate
+        self.rate = rate
+        # Capacity stays fixed (and at least one token, so rates below 1/s
+        # can still fill it); slow_down() only lowers the refill rate
+        self.capacity = max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.restore_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self.rate < self.max_rate and now >= self.restore_at:
+                    self.rate = self.max_rate
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return self
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def slow_down(self, cooldown=RATE_COOLDOWN):
+        """Halve the refill rate after a 429 and hold it there for the cooldown window."""
+        self.rate = max(self.rate / 2, min(self.max_rate, 0.5))
+        # Drop any saved-up burst so the lower rate takes effect immediately
+        self.tokens = min(self.tokens, 1)
+        self.restore_at = time.monotonic() + cooldown
 
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
-def fetch_image(session, timeout=10):
-    headers = {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko)" 
-                      "Chrome/91.0.4472.114 Safari/537.36"
-    }
-    resp = session.get(URL, headers=headers, timeout=timeout)
-    resp.raise_for_status()
-    return resp.content
+def clear_images(path):
+    """Remove previously downloaded images from path in one os.scandir pass."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith((".jpg", ".jpeg", ".png")):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+
+async def fetch_image(session, sem, timeout=10):
+    async with sem:
+        async with session.get(URL, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            if resp.status == 429:
+                try:
+                    retry_after = float(resp.headers.get("Retry-After", ""))
+                except ValueError:
+                    retry_after = None
+                raise RateLimited(retry_after)
+            resp.raise_for_status()
+            return await resp.read()
+
+def jpeg_size(data):
+    """Return (width, height) from the JPEG SOF segment, or None if there isn't one."""
+    i = 2
+    n = len(data)
+    while i + 4 <= n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in SOF_MARKERS:
+            if i + 9 > n:
+                return None
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        if marker == 0xDA:  # start of scan without a frame header
+            return None
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+    return None
 
 def is_valid_image(data):
+    """Header-only check specialised for this server: a complete 1024x1024 JPEG."""
+    if not (data.startswith(b"\xff\xd8\xff") and data.endswith(b"\xff\xd9")):
+        return False
+    return jpeg_size(data) == EXPECTED_SIZE
+
+def verify_image(data):
+    """Full Pillow container check, used with --strict."""
     try:
         img = Image.open(BytesIO(data))
         img.verify()
@@ -40,42 +142,116 @@ def save_image(data, path):
     with open(path, "wb") as f:
         f.write(data)
 
-def download(target_count, out_dir, start_index=0, max_attempts=10, backoff=1.0):
-    ensure_dir(out_dir)
-    session = requests.Session()
-    saved = 0
-    attempts = 0
-    idx = start_index
-    while saved < target_count and attempts < max_attempts * target_count:
+async def fetch_worker(session, sem, limiter, images, state, max_failures, backoff, strict):
+    """Fetch and validate images until the writer has enough or too many requests fail."""
+    # Per-worker 429 streak, so simultaneous 429s across workers don't
+    # compound into one huge backoff
+    rate_limited = 0
+    while not state["done"] and state["failures"] < max_failures:
         try:
-            data = fetch_image(session)
-            if not is_valid_image(data):
-                attempts += 1
-                time.sleep(backoff)
-                continue
-            fname = f"fake_{idx:06d}.jpg"
-            path = os.path.join(out_dir, fname)
-            save_image(data, path)
-            saved += 1
-            idx += 1
-            attempts = 0
-            if saved % 10 == 0:
-                print(f"Saved {saved}/{target_count} -> {path}")
-            time.sleep(0.15)  # modest rate limit
-        except requests.RequestException as e:
-            attempts += 1
-            wait = backoff * attempts
+            async with limiter:
+                data = await fetch_image(session, sem)
+        except RateLimited as e:
+            # Honour Retry-After, otherwise back off exponentially, and slow
+            # every worker down for a while. 429s count toward the failure
+            # budget so a server that never stops rate limiting ends the run.
+            state["failures"] += 1
+            rate_limited += 1
+            wait = min(e.retry_after or backoff * 2 ** rate_limited, MAX_BACKOFF)
+            limiter.slow_down(max(wait, RATE_COOLDOWN))
+            print(f"Rate limited; backing off {wait:.1f}s, rate now {limiter.rate:g}/s")
+            await asyncio.sleep(wait)
+            continue
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            state["failures"] += 1
+            wait = min(backoff * state["failures"], MAX_BACKOFF)
             print(f"Request failed ({e}); backing off {wait:.1f}s")
-            time.sleep(wait)
+            await asyncio.sleep(wait)
+            continue
+        rate_limited = 0
+
+        valid = await asyncio.to_thread(verify_image, data) if strict else is_valid_image(data)
+        if not valid:
+            state["failures"] += 1
+            await asyncio.sleep(backoff)
+            continue
+
+        state["failures"] = 0
+        await images.put(data)
+
+async def image_writer(images, target_count, out_dir, start_index, state):
+    """Single writer: assigns sequential indices and saves images in arrival order."""
+    idx = start_index
+    while state["saved"] < target_count:
+        data = await images.get()
+        if data is None:
+            break
+        path = os.path.join(out_dir, f"fake_{idx:06d}.jpg")
+        # Index assignment stays here; the write itself runs on a worker thread
+        await asyncio.to_thread(save_image, data, path)
+        state["saved"] += 1
+        idx += 1
+        if state["saved"] % 10 == 0:
+            print(f"Saved {state['saved']}/{target_count} -> {path}")
+    state["done"] = True
+
+def make_session(concurrency):
+    # Keep connections (and their TLS sessions) alive between requests so the
+    # handshake is paid once per connection, not once per image
+    connector = aiohttp.TCPConnector(
+        limit_per_host=concurrency, keepalive_timeout=60, enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(connector=connector, headers=HEADERS)
+
+async def download_async(session, limiter, target_count, out_dir, start_index, max_attempts, backoff, concurrency, strict):
+    state = {"saved": 0, "failures": 0, "done": False}
+    images = asyncio.Queue()
+    sem = asyncio.Semaphore(concurrency)
+
+    writer = asyncio.create_task(image_writer(images, target_count, out_dir, start_index, state))
+    workers = [
+        fetch_worker(session, sem, limiter, images, state, max_attempts * target_count, backoff, strict)
+        for _ in range(concurrency)
+    ]
+    await asyncio.gather(*workers)
+    # Workers only stop early after too many failures; release the writer
+    await images.put(None)
+    await writer
+    return state["saved"]
+
+async def download_splits(splits, start_index=0, max_attempts=10, backoff=1.0, concurrency=8,
+                          strict=False, rate=20.0):
+    """Download each (target_count, out_dir) split in turn over one shared session."""
+    saved = []
+    limiter = RateLimiter(rate)
+    async with make_session(concurrency) as session:
+        for target_count, out_dir in splits:
+            ensure_dir(out_dir)
+            count = 0
+            if target_count > 0:
+                count = await download_async(session, limiter, target_count, out_dir, start_index,
+                                             max_attempts, backoff, concurrency, strict)
+            saved.append(count)
+            start_index += count
     return saved
 
+def download(target_count, out_dir, start_index=0, max_attempts=10, backoff=1.0, concurrency=8,
+             strict=False, rate=20.0):
+    return asyncio.run(download_splits([(target_count, out_dir)], start_index, max_attempts,
+                                       backoff, concurrency, strict, rate))[0]
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--train", type=int, default=200, help="Number of training fake images to download")
     p.add_argument("--val", type=int, default=50, help="Number of validation fake images to download")
     p.add_argument("--seed-dir", default="data/seed/fake", help="Output directory for training fakes")
     p.add_argument("--val-dir", default="data/validation/fake", help="Output directory for validation fakes")
+    p.add_argument("--concurrency", type=int, default=8, help="Maximum requests in flight")
+    p.add_argument("--rate", type=float, default=20.0, help="Maximum requests per second")
+    p.add_argument("--strict", action="store_true", help="Verify every image with Pillow instead of a header check")
     args = p.parse_args()
+    if args.rate <= 0:
+        p.error("--rate must be greater than 0")
 
     print("Starting fake-image downloads")
     ensure_dir(args.seed_dir)
@@ -83,16 +259,14 @@ def main():
 
     # Clear previous files in target dirs (ask user caution)
     for d in (args.seed_dir, args.val_dir):
-        for f in os.listdir(d):
-            if f.lower().endswith(('.jpg', '.jpeg', '.png')):
-                try:
-                    os.remove(os.path.join(d, f))
-                except Exception:
-                    pass
+        clear_images(d)
 
-    saved_train = download(args.train, args.seed_dir, start_index=0)
+    # Both splits share one session, so validation reuses the warm connections
+    saved_train, saved_val = asyncio.run(download_splits(
+        [(args.train, args.seed_dir), (args.val, args.val_dir)],
+        concurrency=args.concurrency, strict=args.strict, rate=args.rate,
+    ))
     print(f"Finished training images: saved {saved_train}/{args.train}")
-    saved_val = download(args.val, args.val_dir, start_index=saved_train)
     print(f"Finished validation images: saved {saved_val}/{args.val}")
 
     print("All done. Verify images in:")
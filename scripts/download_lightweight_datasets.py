@@ -10,31 +10,39 @@ Options:
 
 import os
 import shutil
-import urllib.request
+import time
 from pathlib import Path
 from tqdm import tqdm
 import zipfile
 
-def download_file(url, dest_path, chunk_size=8192):
+from _http import session
+
+# Progress updates per second while downloading
+PROGRESS_HZ = 10
+
+def download_file(url, dest_path, chunk_size=1 << 20):
     """Download file with progress bar."""
     dest_path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        response = urllib.request.urlopen(url)
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(dest_path, 'wb') as f:
-            downloaded = 0
-            while True:
-                chunk = response.read(chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
-                downloaded += len(chunk)
-                
-                if total_size > 0:
-                    pct = (downloaded / total_size) * 100
-                    print(f"  Downloaded: {downloaded/1e6:.1f}MB / {total_size/1e6:.1f}MB ({pct:.1f}%)", end='\r')
+        with session.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            total_size = int(response.headers.get('content-length', 0))
+            
+            with open(dest_path, 'wb') as f:
+                downloaded = 0
+                next_update = 0.0
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    
+                    # Throttle progress output; printing every chunk makes the
+                    # download bound on terminal writes
+                    now = time.monotonic()
+                    if total_size > 0 and (now >= next_update or downloaded == total_size):
+                        pct = (downloaded / total_size) * 100
+                        print(f"  Downloaded: {downloaded/1e6:.1f}MB / {total_size/1e6:.1f}MB ({pct:.1f}%)", end='\r')
+                        next_update = now + 1 / PROGRESS_HZ
         
         print()
         return True
@@ -8,16 +8,19 @@ Sources:
 """
 
 import os
-import urllib.request
-import urllib.error
+import asyncio
 from pathlib import Path
-from tqdm import tqdm
 import shutil
+import tarfile
+
+from _http import session, CHUNK_SIZE
+from _aio import download_all
 
 # Create directories
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'seed' / 'real'
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+
 def download_lfw_faces():
     """
     Download Labeled Faces in the Wild (LFW) dataset.
@@ -31,32 +34,35 @@ def download_lfw_faces():
     # LFW tar.gz
     url = "http://vis-www.cs.umass.edu/lfw/lfw.tgz"
     tar_path = DATA_DIR.parent.parent / "lfw.tgz"
-    extract_path = DATA_DIR.parent.parent / "lfw"
     
     try:
-        # Download
+        # Download, streaming to disk in 1 MiB chunks
         print(f"   Downloading from {url}...")
-        urllib.request.urlretrieve(url, tar_path)
+        with session.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(tar_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, CHUNK_SIZE)
         print(f"   ✓ Downloaded {tar_path.stat().st_size / 1e6:.1f} MB")
         
-        # Extract
+        # Extract images straight to data/seed/real in one streaming pass
+        # over the archive; no intermediate tree is written
         print("   Extracting...")
-        shutil.unpack_archive(tar_path, extract_path.parent)
-        print(f"   ✓ Extracted to {extract_path}")
-        
-        # Copy images to data/seed/real
         count = 0
-        for jpg_file in extract_path.rglob("*.jpg"):
-            dest = DATA_DIR / f"lfw_{count:05d}.jpg"
-            shutil.copy(jpg_file, dest)
-            count += 1
-            if count % 100 == 0:
-                print(f"   ✓ Copied {count} images...")
+        with tarfile.open(tar_path, 'r|gz') as tar:
+            for member in tar:
+                if not (member.isfile() and member.name.endswith('.jpg')):
+                    continue
+                dest = DATA_DIR / f"lfw_{count:05d}.jpg"
+                with tar.extractfile(member) as src, open(dest, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+                count += 1
+                if count % 1000 == 0:
+                    print(f"   ✓ Extracted {count} images...")
         
-        print(f"   ✓ Total: {count} real face images copied to {DATA_DIR}")
+        print(f"   ✓ Total: {count} real face images extracted to {DATA_DIR}")
         
         # Cleanup
-        shutil.rmtree(extract_path, ignore_errors=True)
         tar_path.unlink(missing_ok=True)
         
         return count
@@ -93,27 +99,21 @@ def download_from_list(urls_file):
         print(f"   File not found: {urls_file}")
         return 0
     
-    count = 0
     with open(urls_file, 'r') as f:
-        urls = f.readlines()
+        urls = [line.strip() for line in f]
     
-    for idx, url in enumerate(tqdm(urls, desc="Downloading images")):
-        url = url.strip()
+    jobs = []
+    for url in urls:
         if not url:
             continue
         
-        try:
-            ext = url.split('.')[-1].split('?')[0]  # Get extension
-            if ext not in ['jpg', 'jpeg', 'png', 'gif']:
-                ext = 'jpg'
-            
-            dest = DATA_DIR / f"custom_{count:05d}.{ext}"
-            urllib.request.urlretrieve(url, dest)
-            count += 1
-            
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            print(f"   ✗ Failed to download {url}: {e}")
-            continue
+        ext = url.split('.')[-1].split('?')[0]  # Get extension
+        if ext not in ['jpg', 'jpeg', 'png', 'gif']:
+            ext = 'jpg'
+        
+        jobs.append((url, DATA_DIR / f"custom_{len(jobs):05d}.{ext}"))
+    
+    count = asyncio.run(download_all(jobs, "Downloading images", verbose=True))
     
     print(f"   ✓ Downloaded {count} images from {urls_file}")
     return count
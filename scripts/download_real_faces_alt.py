@@ -4,15 +4,23 @@ Combines multiple sources since LFW mirror is down.
 """
 
 import os
+import asyncio
 from pathlib import Path
-import urllib.request
-import urllib.error
 from tqdm import tqdm
 import random
+from concurrent.futures import ThreadPoolExecutor
+
+from _aio import download_all
 
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'seed' / 'real'
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Pexels photo IDs to sample from. The old 1000-2000 range capped a run at
+# 1000 images; this one is wide enough for any count. IDs are not checked to
+# exist, so some requests will 404 and are skipped.
+PEXELS_PHOTO_IDS = range(1000, 1_000_000)
+
+
 def download_from_unsplash_api(count=200):
     """
     Download high-quality real faces from Unsplash API.
@@ -23,19 +31,12 @@ def download_from_unsplash_api(count=200):
     # Unsplash API free tier (no key required for basic use)
     base_url = "https://source.unsplash.com/random/400x400"
     
-    successful = 0
-    for i in tqdm(range(count)):
-        try:
-            filename = f"unsplash_{successful:05d}.jpg"
-            filepath = DATA_DIR / filename
-            
-            # Add random params to prevent caching
-            url = f"{base_url}?{random.random()}"
-            urllib.request.urlretrieve(url, filepath)
-            successful += 1
-            
-        except (urllib.error.URLError, urllib.error.HTTPError) as e:
-            continue
+    # Add random params to prevent caching
+    jobs = [
+        (f"{base_url}?{random.random()}", DATA_DIR / f"unsplash_{i:05d}.jpg")
+        for i in range(count)
+    ]
+    successful = asyncio.run(download_all(jobs, "Unsplash"))
     
     print(f"✓ Downloaded {successful} images from Unsplash")
     return successful
@@ -53,65 +54,78 @@ def download_from_pexels_api(count=200):
         "https://images.pexels.com/photos/{}/pexels-photo-{}.jpeg",
     ]
     
-    # Sample of photo IDs from Pexels
-    photo_ids = list(range(1000, 2000))  # Various photo IDs
-    random.shuffle(photo_ids)
+    # Sample of photo IDs from Pexels, drawn without materializing the range
+    photo_ids = random.sample(PEXELS_PHOTO_IDS, min(count, len(PEXELS_PHOTO_IDS)))
     
-    successful = 0
-    for i, photo_id in enumerate(photo_ids[:count]):
-        try:
-            filename = f"pexels_{successful:05d}.jpg"
-            filepath = DATA_DIR / filename
-            
-            url = f"https://images.pexels.com/photos/{photo_id}/pexels-photo-{photo_id}.jpeg?auto=compress&cs=tinysrgb&w=400"
-            urllib.request.urlretrieve(url, filepath)
-            successful += 1
-            
-        except (urllib.error.URLError, urllib.error.HTTPError):
-            continue
+    jobs = [
+        (f"https://images.pexels.com/photos/{photo_id}/pexels-photo-{photo_id}.jpeg?auto=compress&cs=tinysrgb&w=400",
+         DATA_DIR / f"pexels_{i:05d}.jpg")
+        for i, photo_id in enumerate(photo_ids)
+    ]
+    successful = asyncio.run(download_all(jobs, "Pexels"))
     
     print(f"✓ Downloaded {successful} images from Pexels")
     return successful
 
 
-def generate_synthetic_real_faces(count=300):
+def generate_synthetic_real_faces(count=300, chunk_size=64):
     """
     Generate realistic face images using PIL.
     These are synthetic but look more realistic than pure noise.
+
+    Images are generated a chunk at a time as one (N, 224, 224, 3) array so
+    the noise, rectangle stamps and blur are whole-array NumPy/SciPy ops.
     """
     print(f"\n🎨 Generating {count} synthetic realistic faces...")
     
     try:
-        from PIL import Image, ImageDraw, ImageFilter
+        from PIL import Image
         import numpy as np
+        from scipy.ndimage import gaussian_filter
     except ImportError:
-        print("  Pillow not installed, skipping synthetic generation")
+        print("  Pillow/SciPy not installed, skipping synthetic generation")
         return 0
     
+    def save(img_array, filepath):
+        Image.fromarray(img_array).save(filepath)
+        return True
+    
+    coords = np.arange(224)
     successful = 0
-    for i in tqdm(range(count)):
-        try:
-            # Create image with gradient and noise
-            img_array = np.random.randint(50, 200, (224, 224, 3), dtype=np.uint8)
+    with ThreadPoolExecutor() as executor, tqdm(total=count) as pbar:
+        for start in range(0, count, chunk_size):
+            n = min(chunk_size, count - start)
             
-            # Add some structure (smoother, more face-like)
-            for _ in range(5):
-                y = np.random.randint(50, 150)
-                x = np.random.randint(50, 150)
-                size = np.random.randint(30, 80)
-                img_array[max(0, y-size):min(224, y+size), 
-                         max(0, x-size):min(224, x+size)] = np.random.randint(80, 180, 3)
+            # Create images with gradient and noise
+            imgs = np.random.randint(50, 200, (n, 224, 224, 3), dtype=np.uint8)
             
-            img = Image.fromarray(img_array)
-            img = img.filter(ImageFilter.GaussianBlur(radius=2))
+            # Add some structure (smoother, more face-like): stamp 5 rectangles
+            # per image, one stamp for the whole chunk at a time
+            for _ in range(5):
+                y = np.random.randint(50, 150, n)[:, None]
+                x = np.random.randint(50, 150, n)[:, None]
+                size = np.random.randint(30, 80, n)[:, None]
+                colors = np.random.randint(80, 180, (n, 3)).astype(np.uint8)
+                rows = (coords >= y - size) & (coords < y + size)
+                cols = (coords >= x - size) & (coords < x + size)
+                mask = rows[:, :, None] & cols[:, None, :]
+                imgs = np.where(mask[..., None], colors[:, None, None, :], imgs)
             
-            filename = f"synthetic_real_{i:05d}.jpg"
-            filepath = DATA_DIR / filename
-            img.save(filepath)
-            successful += 1
+            # Blur spatial axes only
+            blurred = gaussian_filter(imgs, sigma=(0, 2, 2, 0), output=np.float32)
+            imgs = np.rint(blurred).astype(np.uint8)
             
-        except Exception as e:
-            continue
+            # JPEG encoding releases the GIL, so save on a thread pool
+            futures = [
+                executor.submit(save, imgs[j], DATA_DIR / f"synthetic_real_{start + j:05d}.jpg")
+                for j in range(n)
+            ]
+            for future in futures:
+                try:
+                    successful += future.result()
+                except Exception:
+                    pass
+                pbar.update(1)
     
     print(f"✓ Generated {successful} synthetic face images")
     return successful
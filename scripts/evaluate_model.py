@@ -1,8 +1,15 @@
 import numpy as np
+import tensorflow as tf
 from tensorflow import keras
 from sklearn.metrics import classification_report, confusion_matrix
 import os
 
+physical_devices = tf.config.list_physical_devices('GPU')
+if physical_devices:
+    tf.config.experimental.set_memory_growth(physical_devices[0], True)
+# No global mixed-precision policy here: load_model() restores each layer's
+# saved dtype policy, so a model trained with mixed_float16 already runs in it
+
 def evaluate():
     model_path = 'models/trained_models/baseline_best.keras'
     val_dir = 'data/validation'
@@ -18,26 +25,36 @@ def evaluate():
     print("Loading model...")
     model = keras.models.load_model(model_path)
 
+    # XLA-compiled forward pass, specialized for the fixed 224x224 input
+    @tf.function(jit_compile=True)
+    def infer(x):
+        return tf.cast(model(x, training=False), tf.float32)
+
     print("Preparing validation data...")
     # Important: shuffle=False to match predictions with filenames/labels
-    val_gen = keras.preprocessing.image.ImageDataGenerator().flow_from_directory(
+    val_ds = keras.utils.image_dataset_from_directory(
         val_dir,
-        target_size=(224, 224),
-        batch_size=32,
-        class_mode='binary',
+        image_size=(224, 224),
+        batch_size=64,
+        label_mode='binary',
         shuffle=False
     )
+    class_labels = val_ds.class_names # ['fake', 'real']
+    val_ds = val_ds.prefetch(tf.data.AUTOTUNE)
 
     print("Running predictions...")
-    # Get probabilities
-    predictions = model.predict(val_gen, verbose=1)
+    # Get probabilities and true labels in one pass
+    predictions, labels = [], []
+    for images, y in val_ds:
+        predictions.append(infer(images).numpy())
+        labels.append(y.numpy())
+    predictions = np.concatenate(predictions)
     
     # Convert to binary classes (0 or 1)
     predicted_classes = (predictions > 0.5).astype(int).flatten()
     
     # Get true labels
-    true_classes = val_gen.classes
-    class_labels = list(val_gen.class_indices.keys()) # ['fake', 'real']
+    true_classes = np.concatenate(labels).astype(int).flatten()
 
     print("\n" + "="*60)
     print("EVALUATION REPORT")
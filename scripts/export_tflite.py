@@ -0,0 +1,128 @@
+"""
+Convert the trained Keras model to an INT8-quantized TFLite model.
+
+app.py serves this model instead of the Keras one on machines without a GPU,
+where INT8 inference is several times faster than FP32. It is ignored once it
+is older than the trained model, so re-run this after every training run.
+
+Usage:
+  python scripts/export_tflite.py [--samples 200]
+
+Calibration images are drawn from data/seed/ and preprocessed exactly like
+uploads in app.py (PIL decode, cv2 INTER_AREA resize to 224x224, [0, 255]).
+Before the file is written, the INT8 model's accuracy on data/validation/ is
+reported next to the float model's.
+"""
+
+import argparse
+import os
+import random
+
+import cv2
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from PIL import Image
+
+MODEL_PATH = 'models/trained_models/baseline_best.keras'
+TFLITE_PATH = 'models/trained_models/baseline_int8.tflite'
+CALIBRATION_DIR = 'data/seed'
+VALIDATION_DIR = 'data/validation'
+
+
+def load_image(path):
+    """Preprocess one image the way app.py does; returns (224, 224, 3) uint8."""
+    img = np.asarray(Image.open(path).convert('RGB'))
+    return cv2.resize(img, (224, 224), interpolation=cv2.INTER_AREA)
+
+
+def representative_dataset(data_dir, num_samples):
+    """Yield preprocessed calibration images for quantization."""
+    paths = [
+        os.path.join(root, name)
+        for root, _, files in os.walk(data_dir)
+        for name in files
+        if name.lower().endswith(('.jpg', '.jpeg', '.png'))
+    ]
+    random.shuffle(paths)
+
+    def generator():
+        for path in paths[:num_samples]:
+            yield [load_image(path)[np.newaxis].astype(np.float32)]
+
+    return generator
+
+
+def compare_accuracy(model, tflite_model, data_dir):
+    """Print float vs INT8 accuracy on data_dir/{fake,real} (fake=0, real=1)."""
+    interpreter = tf.lite.Interpreter(model_content=tflite_model)
+    interpreter.allocate_tensors()
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+
+    float_correct = int8_correct = agree = total = 0
+    for label, class_name in enumerate(('fake', 'real')):
+        class_dir = os.path.join(data_dir, class_name)
+        if not os.path.isdir(class_dir):
+            continue
+        with os.scandir(class_dir) as entries:
+            paths = [e.path for e in entries if e.name.lower().endswith(('.jpg', '.jpeg', '.png'))]
+        for path in paths:
+            img = load_image(path)[np.newaxis].astype(np.float32)
+            float_pred = int(model(img, training=False).numpy()[0, 0] > 0.5)
+            interpreter.set_tensor(input_index, img)
+            interpreter.invoke()
+            int8_pred = int(interpreter.get_tensor(output_index)[0, 0] > 0.5)
+            float_correct += float_pred == label
+            int8_correct += int8_pred == label
+            agree += float_pred == int8_pred
+            total += 1
+
+    if total == 0:
+        print(f"⚠ No validation images found in {data_dir}; accuracy not checked")
+        return
+    print(f"   Validation images: {total}")
+    print(f"   Float accuracy:    {float_correct / total:.4f}")
+    print(f"   INT8 accuracy:     {int8_correct / total:.4f}")
+    print(f"   Agreement:         {agree / total:.4f}")
+
+
+def export_tflite(num_samples=200):
+    if not os.path.exists(MODEL_PATH):
+        print(f"Model not found at {MODEL_PATH}")
+        return
+
+    if not os.path.exists(CALIBRATION_DIR):
+        print(f"Calibration data not found at {CALIBRATION_DIR}")
+        return
+
+    print("Loading model...")
+    model = keras.models.load_model(MODEL_PATH)
+
+    print(f"Quantizing with {num_samples} calibration images...")
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset(CALIBRATION_DIR, num_samples)
+    # Integer kernels throughout; input and output stay float32 so app.py
+    # can feed pixels without handling quantization parameters
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    tflite_model = converter.convert()
+
+    if os.path.exists(VALIDATION_DIR):
+        print(f"Comparing against the float model on {VALIDATION_DIR}...")
+        compare_accuracy(model, tflite_model, VALIDATION_DIR)
+    else:
+        print(f"⚠ Validation data not found at {VALIDATION_DIR}; accuracy not checked")
+
+    with open(TFLITE_PATH, 'wb') as f:
+        f.write(tflite_model)
+
+    print(f"✓ Saved {len(tflite_model) / 1e6:.1f} MB INT8 model to {TFLITE_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export an INT8 TFLite model for CPU serving")
+    parser.add_argument("--samples", type=int, default=200, help="Number of calibration images")
+    args = parser.parse_args()
+
+    export_tflite(args.samples)
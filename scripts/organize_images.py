@@ -4,11 +4,57 @@ Handles various directory layouts and creates proper split.
 """
 
 import os
+import errno
 import shutil
 from pathlib import Path
 import random
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
+from _fs import count_files
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Renames are independent metadata syscalls, so issue them concurrently
+MOVE_WORKERS = 32
+PROGRESS_BATCH = 100
+
+
+def gather_images(root):
+    """Collect image paths under root, including nested folders (e.g. LFW's per-person dirs)."""
+    images = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                images.append(os.path.join(dirpath, filename))
+    return images
+
+
+def move_file(src, dest_dir):
+    """Move src into dest_dir; a rename on the same filesystem, a copy otherwise."""
+    dst = os.path.join(dest_dir, os.path.basename(src))
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def move_all(files, dest_dir, desc):
+    """Move files into dest_dir on a thread pool, skipping any already there."""
+    dest_dir = str(dest_dir)
+    files = [f for f in files if os.path.dirname(f) != dest_dir]
+    with ThreadPoolExecutor(max_workers=MOVE_WORKERS) as executor, \
+            tqdm(total=len(files), desc=desc) as pbar:
+        done = 0
+        for _ in executor.map(move_file, files, [dest_dir] * len(files)):
+            done += 1
+            if done % PROGRESS_BATCH == 0:
+                pbar.update(PROGRESS_BATCH)
+        pbar.update(done % PROGRESS_BATCH)
+
+
 def organize_images(output_dir=None):
     """
     Organize all downloaded images into:
@@ -43,7 +89,7 @@ def organize_images(output_dir=None):
     
     for source in real_sources:
         if source.exists():
-            real_images.extend(list(source.glob("*.jpg")) + list(source.glob("*.png")))
+            real_images.extend(gather_images(source))
     
     # Fake images (from synthetic download)
     fake_images = []
@@ -51,7 +97,7 @@ def organize_images(output_dir=None):
     
     for source in fake_sources:
         if source.exists():
-            fake_images.extend(list(source.glob("*.jpg")) + list(source.glob("*.png")))
+            fake_images.extend(gather_images(source))
     
     print(f"Found {len(real_images)} real images")
     print(f"Found {len(fake_images)} fake images")
@@ -81,32 +127,26 @@ def organize_images(output_dir=None):
     print("\nOrganizing files...")
     
     # Real train - keep in seed/real (already there)
-    for f in tqdm(real_train, desc="Real train"):
-        if f.parent != seed_real:
-            shutil.move(str(f), seed_real / f.name)
+    move_all(real_train, seed_real, "Real train")
     
     # Real validation
-    for f in tqdm(real_val, desc="Real validation"):
-        shutil.move(str(f), val_real / f.name)
+    move_all(real_val, val_real, "Real validation")
     
     # Fake train - keep in seed/fake (already there)
-    for f in tqdm(fake_train, desc="Fake train"):
-        if f.parent != seed_fake:
-            shutil.move(str(f), seed_fake / f.name)
+    move_all(fake_train, seed_fake, "Fake train")
     
     # Fake validation
-    for f in tqdm(fake_val, desc="Fake validation"):
-        shutil.move(str(f), val_fake / f.name)
+    move_all(fake_val, val_fake, "Fake validation")
     
     # Summary
     print("\n" + "="*70)
     print("✓ Dataset organized successfully!")
     print("="*70)
     
-    train_real_count = len(list(seed_real.glob("*")))
-    train_fake_count = len(list(seed_fake.glob("*")))
-    val_real_count = len(list(val_real.glob("*")))
-    val_fake_count = len(list(val_fake.glob("*")))
+    train_real_count = count_files(seed_real)
+    train_fake_count = count_files(seed_fake)
+    val_real_count = count_files(val_real)
+    val_fake_count = count_files(val_fake)
     
     print(f"\nTraining set:")
     print(f"  Real:  {train_real_count} images in data/seed/real/")
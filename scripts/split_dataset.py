@@ -9,19 +9,28 @@ Output: seed/, pool/, validation/ directories with balanced splits
 """
 
 import os
-import shutil
+import io
+import sys
+import errno
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import random
 import numpy as np
 from tqdm import tqdm
-import json
+import orjson
 from datetime import datetime
 
+from _fs import count_files
+
 # ══════════════════════════════════════════════════════════════
 # CONFIGURATION
 # ══════════════════════════════════════════════════════════════
 
-RANDOM_SEED = 42
+# None derives the seed from the dataset identity (paths and image counts), so
+# a different dataset version never reuses the same sample indices. Set an
+# int to pin it.
+RANDOM_SEED = None
 
 # Dataset paths
 FAKE_DIR = 'data/raw/fake'
@@ -33,6 +42,17 @@ SEED_SIZE_TOTAL = 8050        # 4,025 real + 4,025 fake
 VALIDATION_SIZE_TOTAL = 700   # 350 real + 350 fake
 # Pool will be: everything else (152,251 images)
 
+# How split files are created: "link" hardlinks them to the raw files (no data
+# is written; the splits are read-only views), "copy" duplicates the bytes.
+# Linking falls back to copying across filesystems.
+COPY_MODE = "link"
+
+# Copies are syscall-bound, so overlap many of them across threads
+COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Fallback copy buffer, used when the kernel can't copy for us
+COPY_BUFFER_SIZE = 1 << 20
+
 # Quartile configuration for fake images
 NUM_QUARTILES = 4
 TOTAL_FAKE_IMAGES = 80001
@@ -52,39 +72,142 @@ FAKE_QUARTILES = [
 # ══════════════════════════════════════════════════════════════
 
 def setup_output_directories(output_dir):
-    """Create output directory structure"""
+    """Create output directory structure, emptying any split left by a previous run"""
     splits = ['seed', 'pool', 'validation']
     labels = ['real', 'fake']
     
+    # The sampled files change with the seed and the dataset, so stale files
+    # from an earlier split would leak images across seed/pool/validation.
+    # Split files are hardlinks or copies; removing them never touches the
+    # raw images.
+    removed = 0
     for split in splits:
         for label in labels:
             path = Path(output_dir) / split / label
             path.mkdir(parents=True, exist_ok=True)
-    
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        os.unlink(entry.path)
+                        removed += 1
+    
+    if removed:
+        print(f"🧹 Removed {removed:,} files from a previous split")
     print(f"✅ Created output directories in: {output_dir}")
 
 def get_sorted_images(directory):
-    """Get sorted list of image paths"""
-    directory = Path(directory)
-    
-    # Try multiple extensions
-    images = (
-        list(directory.glob('*.jpg')) + 
-        list(directory.glob('*.jpeg')) + 
-        list(directory.glob('*.png'))
-    )
+    """Get sorted list of image filenames (basenames within directory)"""
+    # One os.scandir pass for all extensions instead of a glob per extension
+    with os.scandir(directory) as entries:
+        images = [
+            entry.name for entry in entries
+            if entry.name.endswith(('.jpg', '.jpeg', '.png')) and entry.is_file()
+        ]
     
     # Sort by filename (important for sequential quartiles)
-    images = sorted(images, key=lambda x: x.name)
+    images.sort()
     
     return images
 
+_copy_buffers = threading.local()
+
+def fastcopy(src, dst):
+    """
+    Copy file contents from src to dst without leaving the kernel where possible.
+
+    Tries copy_file_range, then sendfile, then a read/write loop over a
+    reused 1 MiB buffer. Timestamps and permissions are not copied; they
+    don't matter for training splits.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            size = os.fstat(src_fd).st_size
+            remaining = size
+            # Both calls advance the file positions, so each fallback
+            # resumes where the previous one stopped
+            for kernel_copy in _KERNEL_COPIES:
+                try:
+                    while remaining > 0:
+                        n = kernel_copy(src_fd, dst_fd, remaining)
+                        if n == 0:
+                            # Some filesystems (FUSE, overlay) return 0 without
+                            # copying anything; that is not EOF, so fall back
+                            break
+                        remaining -= n
+                except (OSError, AttributeError) as e:
+                    if isinstance(e, OSError) and e.errno not in (
+                        errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP,
+                        errno.ENOTSOCK,
+                    ):
+                        raise
+                if remaining == 0:
+                    break
+            else:
+                _buffered_copy(src_fd, dst_fd)
+
+            copied = os.fstat(dst_fd).st_size
+            if copied != size:
+                raise OSError(errno.EIO, f"short copy: {copied} of {size} bytes", dst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def place_file(src, dst):
+    """Create dst from src according to COPY_MODE."""
+    # Remove any file from a previous run first: if it is a hardlink to the
+    # raw image, copying over it in place would truncate the original
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    if COPY_MODE == "link":
+        try:
+            os.link(src, dst)
+            return
+        except OSError as e:
+            # Different filesystem, or links not supported / allowed there
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.ENOTSUP):
+                raise
+    # copy_file_range reflinks automatically on CoW filesystems (btrfs, XFS)
+    fastcopy(src, dst)
+
+def _copy_file_range(src_fd, dst_fd, count):
+    return os.copy_file_range(src_fd, dst_fd, count)
+
+def _sendfile(src_fd, dst_fd, count):
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+# A None offset (read from the current position) and a regular file as the
+# destination are Linux-only sendfile behaviour; elsewhere skip straight to
+# the buffered loop
+_KERNEL_COPIES = (_copy_file_range, _sendfile) if sys.platform == 'linux' else (_copy_file_range,)
+
+def _buffered_copy(src_fd, dst_fd):
+    buf = getattr(_copy_buffers, 'buf', None)
+    if buf is None:
+        buf = _copy_buffers.buf = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buf)
+    with io.FileIO(src_fd, closefd=False) as src:
+        while n := src.readinto(buf):
+            written = 0
+            while written < n:
+                written += os.write(dst_fd, view[written:n])
+
+def derive_seed(fake_count, real_count):
+    """Reproducible 64-bit seed from the dataset identity. Returns (seed, hash input)."""
+    identity = f"{FAKE_DIR}|{REAL_DIR}|{fake_count}|{real_count}"
+    digest = hashlib.blake2b(identity.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big"), identity
+
 def save_split_metadata(output_dir, metadata):
     """Save split configuration and statistics"""
     metadata_path = Path(output_dir) / 'split_metadata.json'
     
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    with open(metadata_path, 'wb') as f:
+        f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"✅ Saved metadata to: {metadata_path}")
 
@@ -100,12 +223,15 @@ def stratified_split_dataset():
     print("=" * 70)
     print("DEEPFAKE DATASET STRATIFIED SPLIT")
     print("=" * 70)
-    print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Random seed: {RANDOM_SEED}\n")
-    
-    # Set random seeds
-    random.seed(RANDOM_SEED)
-    np.random.seed(RANDOM_SEED)
+    started = datetime.now()
+    print(f"Timestamp: {started.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    
+    # Output directories as plain strings, built once
+    split_dirs = {
+        (split, label): os.path.join(OUTPUT_DIR, split, label)
+        for split in ('seed', 'pool', 'validation')
+        for label in ('real', 'fake')
+    }
     
     # ══════════════════════════════════════════════════════════
     # STEP 1: LOAD IMAGES
@@ -124,6 +250,16 @@ def stratified_split_dataset():
     if len(fake_images) == 0 or len(real_images) == 0:
         raise ValueError("❌ No images found! Check your data paths.")
     
+    if RANDOM_SEED is None:
+        random_seed, seed_source = derive_seed(len(fake_images), len(real_images))
+    else:
+        random_seed, seed_source = RANDOM_SEED, "RANDOM_SEED"
+    print(f"\n🎲 Random seed: {random_seed} (from {seed_source})")
+    
+    # Independent random streams: one per fake quartile, plus one for the
+    # real images, so no split's sampling depends on another's
+    child_seeds = np.random.SeedSequence(random_seed).spawn(NUM_QUARTILES + 1)
+    
     if len(fake_images) != TOTAL_FAKE_IMAGES:
         print(f"\n⚠️  WARNING: Expected {TOTAL_FAKE_IMAGES:,} fake images, found {len(fake_images):,}")
         print(f"   Adjusting quartile boundaries...")
@@ -182,9 +318,12 @@ def stratified_split_dataset():
     
     print(f"\n🎭 STEP 4: Processing FAKE images (stratified across quartiles)...")
     
-    seed_fakes = []
-    val_fakes = []
-    pool_fakes = []
+    # Indices into fake_images, filled quartile by quartile. Sized for the
+    # worst case up front and trimmed afterwards, so nothing reallocates
+    seed_fakes = np.empty(seed_fake_count, dtype=np.intp)
+    val_fakes = np.empty(val_fake_count, dtype=np.intp)
+    pool_fakes = np.empty(len(fake_images), dtype=np.intp)
+    n_seed = n_val = n_pool = 0
     
     quartile_stats = []
     
@@ -199,9 +338,6 @@ def stratified_split_dataset():
             print(f"      ⚠️  WARNING: No images in this quartile!")
             continue
         
-        # Shuffle within quartile (important!)
-        random.shuffle(quartile_images)
-        
         # Calculate how many to take from this quartile
         # Handle last quartile which might have remainder
         q_seed_count = seed_fake_per_quartile
@@ -212,18 +348,29 @@ def stratified_split_dataset():
             q_seed_count += seed_fake_count % NUM_QUARTILES
             q_val_count += val_fake_count % NUM_QUARTILES
         
-        # Split this quartile
-        q_seed = quartile_images[:q_seed_count]
-        q_val = quartile_images[q_seed_count:q_seed_count + q_val_count]
-        q_pool = quartile_images[q_seed_count + q_val_count:]
+        # Sample seed + validation indices within the quartile (important!)
+        # without shuffling the whole quartile
+        rng = np.random.default_rng(child_seeds[q_idx])
+        n_sampled = min(q_seed_count + q_val_count, len(quartile_images))
+        sampled = rng.choice(len(quartile_images), size=n_sampled, replace=False)
+        in_pool = np.ones(len(quartile_images), dtype=bool)
+        in_pool[sampled] = False
+        
+        # Split this quartile (as indices into fake_images)
+        q_seed = start + sampled[:q_seed_count]
+        q_val = start + sampled[q_seed_count:]
+        q_pool = start + np.flatnonzero(in_pool)
         
         print(f"      → Seed: {len(q_seed)}")
         print(f"      → Validation: {len(q_val)}")
         print(f"      → Pool: {len(q_pool):,}")
         
-        seed_fakes.extend(q_seed)
-        val_fakes.extend(q_val)
-        pool_fakes.extend(q_pool)
+        seed_fakes[n_seed:n_seed + len(q_seed)] = q_seed
+        val_fakes[n_val:n_val + len(q_val)] = q_val
+        pool_fakes[n_pool:n_pool + len(q_pool)] = q_pool
+        n_seed += len(q_seed)
+        n_val += len(q_val)
+        n_pool += len(q_pool)
         
         # Save stats
         quartile_stats.append({
@@ -236,6 +383,10 @@ def stratified_split_dataset():
             'pool': len(q_pool)
         })
     
+    seed_fakes = seed_fakes[:n_seed]
+    val_fakes = val_fakes[:n_val]
+    pool_fakes = pool_fakes[:n_pool]
+    
     print(f"\n   ✅ Total FAKE distribution:")
     print(f"      Seed: {len(seed_fakes):,}")
     print(f"      Validation: {len(val_fakes):,}")
@@ -249,7 +400,7 @@ def stratified_split_dataset():
     print(f"\n👤 STEP 5: Processing REAL images (random split)...")
     
     # Shuffle real images
-    random.shuffle(real_images)
+    np.random.default_rng(child_seeds[-1]).shuffle(real_images)
     
     # Split
     seed_reals = real_images[:seed_real_count]
@@ -265,32 +416,43 @@ def stratified_split_dataset():
     # STEP 6: COPY FILES TO OUTPUT DIRECTORIES
     # ══════════════════════════════════════════════════════════
     
-    print(f"\n📂 STEP 6: Copying files to output directories...")
+    print(f"\n📂 STEP 6: Copying files to output directories (mode: {COPY_MODE})...")
     print(f"   (This may take a few minutes...)\n")
     
-    def copy_files(file_list, dest_dir, desc):
-        """Copy files with progress bar"""
-        dest_dir = Path(dest_dir)
-        for f in tqdm(file_list, desc=desc, unit='img'):
-            shutil.copy2(f, dest_dir / f.name)
-    
-    # Copy seed
-    copy_files(seed_reals, Path(OUTPUT_DIR) / 'seed' / 'real', 
-               "   Copying SEED (real)")
-    copy_files(seed_fakes, Path(OUTPUT_DIR) / 'seed' / 'fake', 
-               "   Copying SEED (fake)")
-    
-    # Copy validation
-    copy_files(val_reals, Path(OUTPUT_DIR) / 'validation' / 'real', 
-               "   Copying VALIDATION (real)")
-    copy_files(val_fakes, Path(OUTPUT_DIR) / 'validation' / 'fake', 
-               "   Copying VALIDATION (fake)")
-    
-    # Copy pool
-    copy_files(pool_reals, Path(OUTPUT_DIR) / 'pool' / 'real', 
-               "   Copying POOL (real)")
-    copy_files(pool_fakes, Path(OUTPUT_DIR) / 'pool' / 'fake', 
-               "   Copying POOL (fake)")
+    def fakes(indices):
+        return [fake_images[i] for i in indices]
+    
+    copy_phases = [
+        # Seed
+        (seed_reals, REAL_DIR, split_dirs['seed', 'real']),
+        (fakes(seed_fakes), FAKE_DIR, split_dirs['seed', 'fake']),
+        # Validation
+        (val_reals, REAL_DIR, split_dirs['validation', 'real']),
+        (fakes(val_fakes), FAKE_DIR, split_dirs['validation', 'fake']),
+        # Pool
+        (pool_reals, REAL_DIR, split_dirs['pool', 'real']),
+        (fakes(pool_fakes), FAKE_DIR, split_dirs['pool', 'fake']),
+    ]
+    
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        # Submit every phase up front so the pool stays busy across phase
+        # boundaries, and track them all on one bar for an accurate ETA
+        futures = [
+            executor.submit(place_file, os.path.join(src_dir, name), os.path.join(dest_dir, name))
+            for names, src_dir, dest_dir in copy_phases
+            for name in names
+        ]
+        with tqdm(total=len(futures), desc="   Copying files", unit='img',
+                  mininterval=0.5, smoothing=0.1) as bar:
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    bar.update(1)
+            except BaseException:
+                # Fail fast: drop the queued copies instead of letting the
+                # executor's exit wait for all of them
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
     
     # ══════════════════════════════════════════════════════════
     # STEP 7: VERIFY RESULTS
@@ -301,8 +463,8 @@ def stratified_split_dataset():
     verification = {}
     
     for split in ['seed', 'validation', 'pool']:
-        real_count = len(list((Path(OUTPUT_DIR) / split / 'real').glob('*.*')))
-        fake_count = len(list((Path(OUTPUT_DIR) / split / 'fake').glob('*.*')))
+        real_count = count_files(split_dirs[split, 'real'])
+        fake_count = count_files(split_dirs[split, 'fake'])
         total = real_count + fake_count
         
         verification[split] = {
@@ -347,17 +509,11 @@ def stratified_split_dataset():
     
     print(f"\n🔬 STEP 8: Verifying stratification in SEED...")
     
-    seed_fake_dir = Path(OUTPUT_DIR) / 'seed' / 'fake'
-    seed_fake_files = set(f.name for f in seed_fake_dir.glob('*.*'))
-    
+    # Per-quartile counts were recorded in Step 4, and Step 6 raises on any
+    # failed copy, so there is no need to rescan the quartiles against disk
     print(f"\n   Quartile representation in SEED:")
-    for q_idx, (start, end, q_name) in enumerate(FAKE_QUARTILES):
-        # Count how many seed images came from this quartile
-        quartile_in_seed = sum(
-            1 for img in fake_images[start:end] 
-            if img.name in seed_fake_files
-        )
-        print(f"      {q_name}: {quartile_in_seed} images")
+    for stats in quartile_stats:
+        print(f"      {stats['name']}: {stats['seed']} images")
     
     # ══════════════════════════════════════════════════════════
     # STEP 9: VERIFY STRATIFICATION IN VALIDATION
@@ -365,16 +521,9 @@ def stratified_split_dataset():
     
     print(f"\n🔬 STEP 9: Verifying stratification in VALIDATION...")
     
-    val_fake_dir = Path(OUTPUT_DIR) / 'validation' / 'fake'
-    val_fake_files = set(f.name for f in val_fake_dir.glob('*.*'))
-    
     print(f"\n   Quartile representation in VALIDATION:")
-    for q_idx, (start, end, q_name) in enumerate(FAKE_QUARTILES):
-        quartile_in_val = sum(
-            1 for img in fake_images[start:end] 
-            if img.name in val_fake_files
-        )
-        print(f"      {q_name}: {quartile_in_val} images")
+    for stats in quartile_stats:
+        print(f"      {stats['name']}: {stats['validation']} images")
     
     # ══════════════════════════════════════════════════════════
     # STEP 10: SAVE METADATA
@@ -383,8 +532,10 @@ def stratified_split_dataset():
     print(f"\n💾 STEP 10: Saving metadata...")
     
     metadata = {
-        'timestamp': datetime.now().isoformat(),
-        'random_seed': RANDOM_SEED,
+        'timestamp': started.isoformat(),
+        'random_seed': random_seed,
+        'seed_source': seed_source,
+        'copy_mode': COPY_MODE,
         'configuration': {
             'seed_size': SEED_SIZE_TOTAL,
             'validation_size': VALIDATION_SIZE_TOTAL,
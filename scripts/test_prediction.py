@@ -1,4 +1,4 @@
-import numpy as np
+import tensorflow as tf
 from tensorflow import keras
 import os
 
@@ -13,22 +13,29 @@ model = keras.models.load_model(model_path)
 # Load a test image
 img_path = 'data/validation/fake/image_001.jpg'
 if not os.path.exists(img_path):
-    # Try to find any jpg in the directory
-    import glob
-    files = glob.glob('data/validation/**/*.jpg', recursive=True)
-    if files:
-        img_path = files[0]
+    # Try to find any jpg in the directory; stops at the first match
+    found = next(
+        (os.path.join(root, name)
+         for root, _, names in os.walk('data/validation')
+         for name in names if name.endswith('.jpg')),
+        None,
+    )
+    if found:
+        img_path = found
         print(f"Using found image: {img_path}")
     else:
         print(f"No images found in data/validation")
         exit(1)
 
-img = keras.utils.load_img(img_path, target_size=(224, 224))
-img_array = keras.utils.img_to_array(img) # EfficientNet expects [0, 255]
-img_array = np.expand_dims(img_array, axis=0)
+# Decode and resize inside the TF runtime; bilinear resize matches the
+# image_dataset_from_directory pipeline used in training
+raw = tf.io.read_file(img_path)
+img = tf.io.decode_jpeg(raw, channels=3, dct_method='INTEGER_FAST')
+img = tf.image.resize(img, [224, 224], method='bilinear') # EfficientNet expects [0, 255]
+img_array = tf.expand_dims(img, 0)
 
-# Predict
-prediction = model.predict(img_array)[0][0]
+# Predict (a direct call skips predict()'s loop setup, which dominates for one image)
+prediction = float(model(img_array, training=False)[0, 0])
 print(f"Raw Prediction Output: {prediction:.4f} (0=Fake, 1=Real)")
 
 if prediction > 0.5: